@@ -2,18 +2,28 @@ import os
 import io
 import re
 import time
+import random
+import hashlib
+import json
+import functools
 import requests
 import mimetypes
 import pathlib
-import pandas as pd
-from typing import Optional, Tuple, List
-from google.auth.transport.requests import Request
+import uuid
+from typing import Optional, Tuple, List, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from google.auth.transport.requests import AuthorizedSession, Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from docx import Document
+from docx.table import _Cell
+from lxml import etree
+from PIL import Image, ImageOps
+import xlsxwriter
 
 # Google API imports
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -25,38 +35,210 @@ INPUT_DOCX = "College of Fisheries.docx"   # Change if needed
 OUTPUT_XLSX = "College of Fisheries.xlsx"
 DRIVE_FOLDER_NAME = "DOCX Image Uploads"
 SCOPES = ["https://www.googleapis.com/auth/drive.file"]  # minimal scope for files you create
+DRIVE_CACHE_FILE = ".drive_cache.json"  # remembers the upload folder ID between runs
+DRIVE_API = "https://www.googleapis.com/drive/v3"
+DRIVE_UPLOAD_API = "https://www.googleapis.com/upload/drive/v3"
 
 # If your document uses a different header name for the image column, add it here
 PHOTO_HEADER_CANDIDATES = {"Photo", "Image", "Picture", "Photograph"}
 
+# Number of photos uploaded to Drive concurrently. Keep this modest to stay
+# within the per-user Drive quota.
+UPLOAD_WORKERS = 8
+
+# Number of hyperlinked photos downloaded concurrently. Downloads are
+# started as soon as a row is read, ahead of the slower Drive uploads.
+DOWNLOAD_WORKERS = 32
+
+# Large tables have their rows parsed on a process pool. Below the row
+# threshold, starting the worker processes costs more than it saves.
+PARSE_WORKERS = os.cpu_count() or 1
+PARALLEL_PARSE_MIN_ROWS = 500
+
+# Attempts for a Drive call that hits a rate limit or server error. Retries
+# back off exponentially (capped, with jitter) unless Drive sends Retry-After.
+RETRY_ATTEMPTS = 6
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+RETRY_AFTER_MAX = 60  # never let a Retry-After header park a worker longer than this
+
+# Photos bigger than SHRINK_MIN_BYTES are re-encoded as JPEG, at most
+# SHRINK_MAX_EDGE pixels on the long edge, before upload
+SHRINK_MIN_BYTES = 500_000
+SHRINK_MAX_EDGE = 1600
+SHRINK_JPEG_QUALITY = 85
+
+# Images larger than this are sent as a resumable upload in chunks of this size
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+
+# Drive accepts at most 100 calls per batch HTTP request
+PERMISSION_BATCH_SIZE = 100
+
 # ---------------------------
 # Google Drive helpers
 # ---------------------------
 
-def get_drive_service() -> any:
+@functools.lru_cache(maxsize=1)
+def get_drive_credentials() -> Credentials:
     """
-    Returns an authenticated Drive API client.
+    Returns valid OAuth credentials for the Drive API, cached for the life of the process.
     Requires credentials.json in the current directory on first run.
+    A failed token refresh is raised; delete token.json to sign in again.
     """
     creds = None
+    saved = None
     if os.path.exists("token.json"):
         creds = Credentials.from_authorized_user_file("token.json", SCOPES)
+        saved = (creds.token, creds.refresh_token)
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
-            # Attempt refresh
-            try:
-                creds.refresh(Request())           # RIGHT
-            except Exception:
-                pass
+            creds.refresh(Request())
         if not creds or not creds.valid:
             flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
             creds = flow.run_local_server(port=0)
+    # Only rewrite token.json when the token actually changed
+    if (creds.token, creds.refresh_token) != saved:
         with open("token.json", "w") as token:
             token.write(creds.to_json())
+    return creds
+
+
+@functools.lru_cache(maxsize=1)
+def get_drive_service(creds: Optional[Credentials] = None) -> any:
+    """
+    Returns an authenticated Drive API client.
+    Requires credentials.json in the current directory on first run.
+    """
+    if creds is None:
+        creds = get_drive_credentials()
     return build("drive", "v3", credentials=creds)
 
 
+@functools.lru_cache(maxsize=1)
+def get_drive_session(creds: Optional[Credentials] = None) -> AuthorizedSession:
+    """
+    Returns an authenticated requests session for raw Drive REST calls.
+    Unlike a googleapiclient service it needs no discovery document, and it
+    can be shared by the upload workers, which reuse its pooled connections.
+    """
+    if creds is None:
+        creds = get_drive_credentials()
+    session = AuthorizedSession(creds)
+    session.mount("https://", HTTPAdapter(pool_maxsize=UPLOAD_WORKERS))
+    return session
+
+
+def _send(session: AuthorizedSession, method: str, url: str, **kwargs) -> requests.Response:
+    """Make a Drive REST call, raising requests.HTTPError on a 4xx/5xx reply."""
+    r = session.request(method, url, allow_redirects=False, **kwargs)
+    r.raise_for_status()
+    return r
+
+
+def _load_drive_cache() -> dict:
+    """Read the {folder_name: folder_id} sidecar; missing or corrupt files give an empty cache."""
+    try:
+        with open(DRIVE_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_drive_cache(cache: dict) -> None:
+    with open(DRIVE_CACHE_FILE, "w") as f:
+        json.dump(cache, f, indent=2)
+
+
+def _drive_error_reasons(content: bytes) -> List[str]:
+    """Reasons listed in a Drive error body, {"error": {"errors": [{"reason": ...}]}}."""
+    try:
+        body = json.loads(content)
+    except ValueError:
+        body = None
+    # OAuth and proxy errors can use other shapes, e.g. {"error": "invalid_request"}
+    err = body.get("error") if isinstance(body, dict) else None
+    details = err.get("errors") if isinstance(err, dict) else None
+    if not isinstance(details, list):
+        return []
+    return [d.get("reason", "") for d in details if isinstance(d, dict)]
+
+
+def _http_error_details(error: Exception) -> Optional[Tuple[int, str, List[str]]]:
+    """
+    (status, Retry-After, error reasons) of a failed Drive call, made either
+    through googleapiclient or an AuthorizedSession; None for other errors.
+    """
+    # Both transports read the raw body: googleapiclient's error_details
+    # prefers google.rpc details, whose ErrorInfo reason is e.g.
+    # RATE_LIMIT_EXCEEDED rather than Drive's userRateLimitExceeded.
+    if isinstance(error, HttpError):
+        retry_after = error.resp.get("retry-after", "")
+        return error.resp.status, retry_after, _drive_error_reasons(error.content)
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        retry_after = error.response.headers.get("Retry-After", "")
+        return error.response.status_code, retry_after, _drive_error_reasons(error.response.content)
+    return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (ConnectionError, TimeoutError, requests.ConnectionError, requests.Timeout)):
+        return True
+    details = _http_error_details(error)
+    if details is None:
+        return False
+    status, _, reasons = details
+    if status == 403:
+        # Drive reports rate limiting as 403 (user/sharing)RateLimitExceeded;
+        # any other 403 is a real permission error
+        return any(r.lower().endswith("ratelimitexceeded") for r in reasons)
+    return status in RETRY_STATUSES
+
+
+def _retry(fn, *args, **kwargs):
+    """
+    Call fn, retrying rate limits and transient failures with capped, jittered
+    exponential backoff. A Retry-After header from Drive takes precedence.
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if not _is_retryable(e) or attempt == RETRY_ATTEMPTS - 1:
+                raise
+            time.sleep(_retry_delay(e, attempt))
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retry number attempt + 1 of a call that failed with error."""
+    details = _http_error_details(error)
+    retry_after = details[1] if details else ""
+    if retry_after.isdigit():
+        return min(float(retry_after), RETRY_AFTER_MAX)
+    return min(32, 0.5 * 2 ** attempt) + random.random()
+
+
 def find_or_create_folder(service, name: str) -> str:
+    """
+    Find a folder by exact name or create it; return folder ID.
+    The ID is remembered in DRIVE_CACHE_FILE so later runs only need a cheap files().get.
+    """
+    cache = _load_drive_cache()
+    cached_id = cache.get(name)
+    if cached_id:
+        try:
+            meta = _retry(service.files().get(fileId=cached_id, fields="id, trashed").execute)
+            if not meta.get("trashed"):
+                return meta["id"]
+        except HttpError:
+            # Deleted or no longer accessible; look it up again
+            pass
+
+    folder_id = _lookup_or_create_folder(service, name)
+    cache[name] = folder_id
+    _save_drive_cache(cache)
+    return folder_id
+
+
+def _lookup_or_create_folder(service, name: str) -> str:
     """Find a folder by exact name or create it; return folder ID."""
     safe_name = name.replace("'", "\\'")
     q = (
@@ -65,7 +247,7 @@ def find_or_create_folder(service, name: str) -> str:
         f"trashed = false"
     )
     try:
-        res = service.files().list(
+        res = _retry(service.files().list(
             q=q,
             spaces="drive",
             fields="files(id, name)",
@@ -73,59 +255,194 @@ def find_or_create_folder(service, name: str) -> str:
             includeItemsFromAllDrives=False,
             supportsAllDrives=False,
             corpora="user",
-        ).execute()
+        ).execute)
         files = res.get("files", [])
         if files:
             return files[0]["id"]
     except Exception:
         pass
 
-    folder = service.files().create(
+    folder = _retry(service.files().create(
         body={"name": name, "mimeType": "application/vnd.google-apps.folder"},
         fields="id",
         supportsAllDrives=False,
-    ).execute()
+    ).execute)
     return folder["id"]
 
 
-
-def set_public_anyone_reader(service, file_id: str) -> None:
+def set_public_anyone_reader(session: AuthorizedSession, file_id: str) -> None:
     """
     Makes a file publicly readable.
     """
-    try:
-        service.permissions().create(
+    _retry(
+        _send, session, "POST", f"{DRIVE_API}/files/{file_id}/permissions",
+        json={"type": "anyone", "role": "reader"},
+    )
+
+
+def folder_is_public(service, folder_id: str) -> bool:
+    """
+    True if anyone with the link can already open the folder. Files uploaded
+    into it inherit that access, so they need no permission call of their own.
+    """
+    res = _retry(service.permissions().list(
+        fileId=folder_id,
+        fields="permissions(type, role)",
+    ).execute)
+    # every role granted to "anyone" (reader, commenter, writer) includes viewing
+    return any(p.get("type") == "anyone" for p in res.get("permissions", []))
+
+
+def set_public_anyone_reader_batch(service, file_ids: List[str]) -> None:
+    """
+    Makes many files publicly readable, PERMISSION_BATCH_SIZE calls per HTTP request.
+    Calls that fail inside a batch are retried one by one.
+    """
+    failed: List[str] = []
+
+    def on_response(request_id, response, exception):
+        if exception is not None:
+            failed.append(request_id)
+
+    for start in range(0, len(file_ids), PERMISSION_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_response)
+        for file_id in file_ids[start:start + PERMISSION_BATCH_SIZE]:
+            batch.add(
+                service.permissions().create(
+                    fileId=file_id,
+                    body={"type": "anyone", "role": "reader"},
+                ),
+                request_id=file_id,
+            )
+        _retry(batch.execute)
+
+    for file_id in failed:
+        _retry(service.permissions().create(
             fileId=file_id,
             body={"type": "anyone", "role": "reader"},
-        ).execute()
-    except HttpError as e:
-        # If permission already exists or rate-limited, try a light backoff
-        if e.resp.status in (403, 429, 500, 503):
-            time.sleep(2)
-            service.permissions().create(
-                fileId=file_id,
-                body={"type": "anyone", "role": "reader"},
-            ).execute()
-        else:
-            raise
+        ).execute)
+
+
+def public_view_url(file_id: str) -> str:
+    """Public view URL that renders the image."""
+    return f"https://drive.google.com/uc?export=view&id={file_id}"
 
 
-def upload_image_bytes(service, folder_id: str, name_hint: str, data: bytes, mime: Optional[str]) -> str:
+def create_image_file(
+    session: AuthorizedSession, folder_id: str, name_hint: str, data: bytes, mime: Optional[str]
+) -> str:
     """
-    Upload raw image bytes to Drive, return the public view URL.
+    Upload raw image bytes to Drive without sharing them, return the file ID.
     """
     if not mime:
         mime = "application/octet-stream"
-    media = MediaIoBaseUpload(io.BytesIO(data), mimetype=mime, resumable=False)
-    metadata = {"name": name_hint, "parents": [folder_id]}
-    file = service.files().create(body=metadata, media_body=media, fields="id").execute()
-    file_id = file["id"]
-    set_public_anyone_reader(service, file_id)
-    # Public view URL that renders the image
-    return f"https://drive.google.com/uc?export=view&id={file_id}"
+    metadata = json.dumps({"name": name_hint, "parents": [folder_id]})
+    if len(data) <= UPLOAD_CHUNK_SIZE:
+        # Small images fit in a single multipart/related request
+        boundary = uuid.uuid4().hex
+        body = b"".join([
+            f"--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n".encode(),
+            metadata.encode(),
+            f"\r\n--{boundary}\r\nContent-Type: {mime}\r\n\r\n".encode(),
+            data,
+            f"\r\n--{boundary}--".encode(),
+        ])
+        r = _retry(
+            _send, session, "POST", f"{DRIVE_UPLOAD_API}/files?uploadType=multipart&fields=id",
+            data=body, headers={"Content-Type": f"multipart/related; boundary={boundary}"},
+        )
+        return r.json()["id"]
+
+    # Large images go up in chunks; a failed chunk is retried on its own
+    return _upload_resumable(session, metadata, data, mime)
+
+
+def _start_resumable_upload(session: AuthorizedSession, metadata: str, data: bytes, mime: str) -> str:
+    """Open a resumable upload session and return its upload URL."""
+    r = _retry(
+        _send, session, "POST", f"{DRIVE_UPLOAD_API}/files?uploadType=resumable&fields=id",
+        data=metadata,
+        headers={
+            "Content-Type": "application/json; charset=UTF-8",
+            "X-Upload-Content-Type": mime,
+            "X-Upload-Content-Length": str(len(data)),
+        },
+    )
+    return r.headers["Location"]
+
+
+def _upload_resumable(session: AuthorizedSession, metadata: str, data: bytes, mime: str) -> str:
+    """
+    Send data in UPLOAD_CHUNK_SIZE chunks over a resumable session; return the file ID.
+    After a failed chunk the session's status is queried and the upload
+    resumes from the last byte Drive stored. An expired session (404/410)
+    is restarted from the beginning.
+    """
+    total = len(data)
+    upload_url = _start_resumable_upload(session, metadata, data, mime)
+    offset = 0
+    resync = False
+    attempt = 0
+    while True:
+        try:
+            if resync:
+                # Ask Drive how much of the upload it actually has
+                r = _send(session, "PUT", upload_url, headers={"Content-Range": f"bytes */{total}"})
+            else:
+                end = min(offset + UPLOAD_CHUNK_SIZE, total)
+                r = _send(
+                    session, "PUT", upload_url,
+                    data=data[offset:end],
+                    headers={"Content-Range": f"bytes {offset}-{end - 1}/{total}"},
+                )
+        except Exception as e:
+            details = _http_error_details(e)
+            expired = details is not None and details[0] in (404, 410)
+            if not (expired or _is_retryable(e)) or attempt == RETRY_ATTEMPTS - 1:
+                raise
+            time.sleep(_retry_delay(e, attempt))
+            attempt += 1
+            if expired:
+                upload_url = _start_resumable_upload(session, metadata, data, mime)
+                offset = 0
+                resync = False
+            else:
+                resync = True
+            continue
+
+        if r.status_code != 308:
+            return r.json()["id"]
+        # 308 Resume Incomplete: carry on after the last byte Drive stored
+        received = r.headers.get("Range")
+        new_offset = int(received.rsplit("-", 1)[1]) + 1 if received else 0
+        # Only a chunk that moved the upload forward earns a fresh retry
+        # budget; a successful status query alone must not, or a chunk that
+        # keeps failing would be retried forever.
+        if not resync and new_offset > offset:
+            attempt = 0
+        offset = new_offset
+        resync = False
+
+
+def upload_image_bytes(
+    session: AuthorizedSession,
+    folder_id: str,
+    name_hint: str,
+    data: bytes,
+    mime: Optional[str],
+    make_public: bool = True,
+) -> str:
+    """
+    Upload raw image bytes to Drive, return the public view URL.
+    Pass make_public=False when the folder is already public (see folder_is_public).
+    """
+    file_id = create_image_file(session, folder_id, name_hint, data, mime)
+    if make_public:
+        set_public_anyone_reader(session, file_id)
+    return public_view_url(file_id)
 
 
-def upload_image_file(service, folder_id: str, file_path: str) -> str:
+def upload_image_file(session: AuthorizedSession, folder_id: str, file_path: str) -> str:
     """
     Upload a local image file to Drive, return the public view URL.
     """
@@ -133,85 +450,272 @@ def upload_image_file(service, folder_id: str, file_path: str) -> str:
     with open(file_path, "rb") as f:
         data = f.read()
     name_hint = pathlib.Path(file_path).name
-    return upload_image_bytes(service, folder_id, name_hint, data, mime)
+    return upload_image_bytes(session, folder_id, name_hint, data, mime)
 
 
 # ---------------------------
 # DOCX table parsing helpers
 # ---------------------------
 
-def cell_text(cell) -> str:
-    paras = [p.text.strip() for p in cell.paragraphs]
-    joined = "\n".join([p for p in paras if p is not None])
-    return joined.strip()
+NS = {
+    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+}
+R_ID = f"{{{NS['r']}}}id"
+W_T = f"{{{NS['w']}}}t"
+W_VAL = f"{{{NS['w']}}}val"
+
+W_BR = f"{{{NS['w']}}}br"
+W_TYPE = f"{{{NS['w']}}}type"
+
+# Run children that render as a character other than their text, as in
+# python-docx's Run.text (w:br is handled separately: only line breaks count)
+_RUN_CHARS = {
+    f"{{{NS['w']}}}tab": "\t",
+    f"{{{NS['w']}}}ptab": "\t",
+    f"{{{NS['w']}}}cr": "\n",
+    f"{{{NS['w']}}}noBreakHyphen": "-",
+}
+
+# Compiled once and reused for every cell
+_XP_HYPERLINK = etree.XPath(".//w:hyperlink[@r:id]", namespaces=NS)
+_XP_INSTR = etree.XPath(".//w:instrText", namespaces=NS)
+_XP_BLIP = etree.XPath(".//a:blip/@r:embed", namespaces=NS)
+_XP_PARAGRAPHS = etree.XPath("./w:p", namespaces=NS)
+_XP_TABLE_ROWS = etree.XPath("./w:tr", namespaces=NS)
+_XP_ROW_CELLS = etree.XPath("./w:tc", namespaces=NS)
+_XP_GRID_SPAN = etree.XPath("./w:tcPr/w:gridSpan/@w:val", namespaces=NS)
+_XP_VMERGE = etree.XPath("./w:tcPr/w:vMerge", namespaces=NS)
+# Only the runs python-docx's Paragraph.text reads: direct w:r children and
+# runs inside w:hyperlink. A descendant search would also pick up text boxes
+# (twice, via mc:Choice and mc:Fallback) and w:ins/w:sdt/w:fldSimple content.
+_RUN_CONTENT = ("t", "tab", "ptab", "br", "cr", "noBreakHyphen")
+_XP_RUN_TEXT = etree.XPath(
+    " | ".join(
+        f"./{parent}w:r/w:{child}"
+        for parent in ("", "w:hyperlink/")
+        for child in _RUN_CONTENT
+    ),
+    namespaces=NS,
+)
+_RE_HYPERLINK_FIELD = re.compile(r'HYPERLINK\s+"([^"]+)"')
+
+
+def _run_content_text(el: etree._Element) -> str:
+    if el.tag == W_T:
+        return el.text or ""
+    if el.tag == W_BR:
+        # Page and column breaks render as nothing; only line breaks are "\n"
+        return "\n" if el.get(W_TYPE, "textWrapping") == "textWrapping" else ""
+    return _RUN_CHARS[el.tag]
+
+
+def tc_text(tc: etree._Element) -> str:
+    # Read the w:t nodes straight from the XML rather than building
+    # python-docx Paragraph/Run wrappers for every cell.
+    paras: List[str] = []
+    for p in _XP_PARAGRAPHS(tc):
+        text = "".join(_run_content_text(el) for el in _XP_RUN_TEXT(p))
+        paras.append(text.strip())
+    return "\n".join(paras).strip()
+
+
+def cell_text(cell: _Cell) -> str:
+    return tc_text(cell._tc)
+
+
+def _grid_span(tc: etree._Element) -> int:
+    span = _XP_GRID_SPAN(tc)
+    return int(span[0]) if span else 1
+
+
+def is_vmerge_continuation(tc: etree._Element) -> bool:
+    """True for a cell that continues a vertical merge from the row above."""
+    vmerge = _XP_VMERGE(tc)
+    return bool(vmerge) and vmerge[0].get(W_VAL, "continue") == "continue"
+
+
+def grid_cells(tr: etree._Element) -> List[etree._Element]:
+    """The w:tc of each grid column of a w:tr; a cell spanning several columns is repeated."""
+    cells: List[etree._Element] = []
+    for tc in _XP_ROW_CELLS(tr):
+        cells.extend([tc] * _grid_span(tc))
+    return cells
+
+
+def row_texts(tr: etree._Element) -> List[Optional[str]]:
+    """
+    Text of each grid column of a w:tr, laid out like python-docx's row.cells:
+    a cell spanning several columns is repeated, and a vertically merged
+    continuation cell is None (it shows the text of the cell above).
+    """
+    texts: List[Optional[str]] = []
+    for tc in _XP_ROW_CELLS(tr):
+        text = None if is_vmerge_continuation(tc) else tc_text(tc)
+        texts.extend([text] * _grid_span(tc))
+    return texts
+
+
+def _row_texts_from_xml(tr_xml: bytes) -> List[Optional[str]]:
+    """Process-pool entry point: row_texts() for one serialized w:tr."""
+    return row_texts(etree.fromstring(tr_xml))
 
 
-def first_hyperlink_url(cell) -> Optional[str]:
+def iter_row_texts(
+    trs: List[etree._Element], above: Optional[List[str]] = None
+) -> Iterator[List[str]]:
+    """
+    Yield the cell texts of each w:tr, in order.
+    `above` is the text of the row before trs[0] (e.g. the header row), which
+    cells vertically merged down from it repeat.
+    Large tables are parsed on a process pool so parsing overlaps the uploads
+    the caller starts while consuming rows.
+    """
+    if len(trs) >= PARALLEL_PARSE_MIN_ROWS and PARSE_WORKERS > 1:
+        pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        chunksize = max(1, len(trs) // (PARSE_WORKERS * 4))
+        parsed = pool.map(_row_texts_from_xml, (etree.tostring(tr) for tr in trs), chunksize=chunksize)
+    else:
+        pool = None
+        parsed = map(row_texts, trs)
+
+    try:
+        above = above or []
+        for texts in parsed:
+            texts = [
+                t if t is not None else (above[i] if i < len(above) else "")
+                for i, t in enumerate(texts)
+            ]
+            above = texts
+            yield texts
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def first_hyperlink_url(cell: _Cell) -> Optional[str]:
     """
     Return the first external hyperlink URL found in the cell, if any.
     Handles both w:hyperlink with r:id and field-code HYPERLINK cases.
     """
-    try:
-        tc = cell._tc
-        ns = {
-            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
-            "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-        }
-        # direct hyperlinks
-        for h in tc.xpath(".//w:hyperlink[@r:id]", namespaces=ns):
-            rId = h.get("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id")
-            if rId and rId in cell.part.rels:
-                rel = cell.part.rels[rId]
-                if getattr(rel, "is_external", False):
-                    return rel.target_ref
-
-        # field code hyperlinks
-        for instr in tc.xpath(".//w:instrText", namespaces=ns):
-            t = instr.text or ""
-            if "HYPERLINK" in t:
-                m = re.search(r'HYPERLINK\s+"([^"]+)"', t)
-                if m:
-                    return m.group(1)
-    except Exception:
-        return None
+    tc = cell._tc
+    rels = cell.part.rels
+    # direct hyperlinks
+    for h in _XP_HYPERLINK(tc):
+        rel = rels.get(h.get(R_ID))
+        if rel is not None and rel.is_external:
+            return rel.target_ref
+
+    # field code hyperlinks
+    for instr in _XP_INSTR(tc):
+        t = instr.text or ""
+        if "HYPERLINK" in t:
+            m = _RE_HYPERLINK_FIELD.search(t)
+            if m:
+                return m.group(1)
     return None
 
 
-def first_embedded_image_bytes(cell) -> Optional[Tuple[bytes, str]]:
+def first_embedded_image_bytes(cell: _Cell) -> Optional[Tuple[bytes, str]]:
     """
     Returns (blob, mime) of the first embedded image in a cell (supports inline & anchor images).
     """
-    try:
-        # Loop over all images in cell's part relationships
-        rels = cell.part.rels
-        for rel in rels:
-            target = rels[rel].target_ref
-            # Skip non-image relationships
-            if not hasattr(rels[rel].target_part, "content_type"):
-                continue
-            content_type = rels[rel].target_part.content_type
-            if content_type.startswith("image/"):
-                image_part = rels[rel].target_part
-                blob = image_part.blob
-                mime = content_type
-                return blob, mime
-    except:
-        pass
+    # Follow the picture's own r:embed reference instead of scanning every
+    # relationship of the (usually document-wide) part.
+    rels = cell.part.rels
+    for rId in _XP_BLIP(cell._tc):
+        rel = rels.get(rId)
+        if rel is None or rel.is_external:
+            continue
+        image_part = rel.target_part
+        if image_part.content_type.startswith("image/"):
+            return image_part.blob, image_part.content_type
     return None
 
 
 
+# Shared session so image downloads reuse pooled keep-alive connections
+# instead of paying a TCP+TLS handshake per row. Transient failures are
+# retried with exponential backoff.
+_SESSION = requests.Session()
+_DOWNLOAD_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # Upload workers wait on these downloads, so cap Retry-After as for Drive calls
+        retry_after_max=RETRY_AFTER_MAX,
+    ),
+)
+_SESSION.mount("https://", _DOWNLOAD_ADAPTER)
+_SESSION.mount("http://", _DOWNLOAD_ADAPTER)
+
+
+def shrink_image(data: bytes, mime: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """
+    Downscale and re-encode a large photo as JPEG so less data goes to Drive.
+    Small images, and anything Pillow cannot decode, are returned unchanged.
+    """
+    if len(data) < SHRINK_MIN_BYTES:
+        return data, mime
+    try:
+        img = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+        img.thumbnail((SHRINK_MAX_EDGE, SHRINK_MAX_EDGE))
+        out = io.BytesIO()
+        img.convert("RGB").save(out, "JPEG", quality=SHRINK_JPEG_QUALITY, optimize=True)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return data, mime
+    shrunk = out.getvalue()
+    if len(shrunk) >= len(data):
+        return data, mime
+    return shrunk, "image/jpeg"
+
+
 def download_url_bytes(url: str) -> Optional[Tuple[bytes, str]]:
     try:
-        r = requests.get(url, timeout=20)
+        r = _SESSION.get(url, timeout=(3, 20))
         r.raise_for_status()
         data = r.content
         mime = r.headers.get("Content-Type", None)
         return data, mime
-    except Exception:
+    except requests.RequestException:
         return None
 
 
+def resolve_photo_link(
+    session: AuthorizedSession,
+    folder_id: str,
+    r_i: int,
+    embedded: Optional[Tuple[bytes, str]],
+    url: Optional[str],
+    download: Optional[Future] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Upload a row's photo to Drive. Runs on a worker thread.
+    `download`, if given, is a prefetch of download_url_bytes(url).
+    Returns (link, file_id); file_id is set only when a new Drive file still needs sharing.
+    """
+    # 1) Embedded image in the cell
+    if embedded:
+        blob, mime = shrink_image(*embedded)
+        file_id = create_image_file(session, folder_id, f"row{r_i}_photo", blob, mime)
+        return public_view_url(file_id), file_id
+
+    # 2) Hyperlink present. If yes, download it then upload to Drive
+    if url:
+        fetched = download.result() if download is not None else download_url_bytes(url)
+        if fetched:
+            blob, mime = shrink_image(*fetched)
+            file_id = create_image_file(session, folder_id, f"row{r_i}_photo_from_link", blob, mime)
+            return public_view_url(file_id), file_id
+        # Keep the original URL if download failed
+        return url, None
+    return None, None
+
+
 # ---------------------------
 # Main conversion
 # ---------------------------
@@ -236,18 +740,23 @@ def convert_docx_to_excel_with_drive(
     if table is None:
         table = doc.tables[0]
 
+    # Walk the table XML once instead of through python-docx's row/cell proxies
+    trs = _XP_TABLE_ROWS(table._tbl)
+
     # Build headers
-    first_row = table.rows[0]
-    headers = [cell_text(c) for c in first_row.cells]
+    headers = [h or "" for h in row_texts(trs[0])]
 
     # Detect if first row is header-like
     header_like = sum(1 for h in headers if h.strip()) >= max(1, int(len(headers) * 0.6))
     if header_like:
-        data_rows = table.rows[1:]
+        data_rows = trs[1:]
+        # Cells merged down from the header row repeat its content
+        above = headers
     else:
         # Generate generic headers
-        headers = [f"Column {i+1}" for i in range(len(table.rows[0].cells))]
-        data_rows = table.rows[:]
+        headers = [f"Column {i+1}" for i in range(len(headers))]
+        data_rows = trs[:]
+        above = None
 
     # Identify the Photo column index if present
     photo_idx = None
@@ -257,53 +766,91 @@ def convert_docx_to_excel_with_drive(
             break
 
     # Authenticate Drive and prepare folder
-    drive = get_drive_service()
+    creds = get_drive_credentials()
+    drive = get_drive_service(creds)
+    session = get_drive_session(creds)
     folder_id = find_or_create_folder(drive, folder_name)
 
-    rows_out: List[dict] = []
-    for r_i, row in enumerate(data_rows, start=1):
-        values = []
-        for c_i, cell in enumerate(row.cells):
-            values.append(cell_text(cell))
-
-        # If Photo column exists, upload and replace with public link
-        if photo_idx is not None and photo_idx < len(row.cells):
-            photo_cell = row.cells[photo_idx]
-            public_link = None
-
-            # 1) Embedded image in the cell
-            embedded = first_embedded_image_bytes(photo_cell)
-            if embedded:
-                blob, mime = embedded
-                name_hint = f"row{r_i}_photo"
-                public_link = upload_image_bytes(drive, folder_id, name_hint, blob, mime)
-
-            # 2) Hyperlink present. If yes, download it then upload to Drive
-            if not public_link:
-                url = first_hyperlink_url(photo_cell)
-                if url:
-                    fetched = download_url_bytes(url)
-                    if fetched:
-                        blob, mime = fetched
-                        name_hint = f"row{r_i}_photo_from_link"
-                        public_link = upload_image_bytes(drive, folder_id, name_hint, blob, mime)
-                    else:
-                        # Keep the original URL if download failed
-                        public_link = url
-
-            # 3) If neither image nor link, leave text as-is
-            if public_link:
-                values[photo_idx] = public_link
-
-        # Pack row dict with headers
-        row_dict = {}
-        for i, h in enumerate(headers):
-            row_dict[h if h else f"Column {i+1}"] = values[i] if i < len(values) else ""
-        rows_out.append(row_dict)
-
-    # Save to Excel
-    df = pd.DataFrame(rows_out, columns=headers)
-    df.to_excel(output_xlsx, index=False)
+    # First pass: read the table and queue photo uploads as we go.
+    # Uploads are independent network I/O, so they run on a thread pool
+    # while the remaining rows are parsed.
+    rows_out: List[List[str]] = []
+    photo_tc = None
+    if header_like and photo_idx is not None:
+        header_cells = grid_cells(trs[0])
+        if photo_idx < len(header_cells):
+            photo_tc = header_cells[photo_idx]
+    photo_futures = {}
+    # Identical photos are uploaded once: blob digest / source URL -> pending upload
+    upload_cache = {}
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool, \
+            ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as downloads:
+        for r_i, (tr, texts) in enumerate(zip(data_rows, iter_row_texts(data_rows, above)), start=1):
+            # One value per header column
+            rows_out.append([texts[i] if i < len(texts) else "" for i in range(len(headers))])
+
+            # If Photo column exists, queue an upload that resolves to a public link
+            if photo_idx is not None and photo_idx < len(texts):
+                tc = grid_cells(tr)[photo_idx]
+                # A vertically merged photo cell shows the photo of the cell above
+                if not is_vmerge_continuation(tc):
+                    photo_tc = tc
+                if photo_tc is None:
+                    continue
+                photo_cell = _Cell(photo_tc, table)
+                embedded = first_embedded_image_bytes(photo_cell)
+                url = None if embedded else first_hyperlink_url(photo_cell)
+                if embedded:
+                    key = hashlib.blake2b(embedded[0], digest_size=16).digest()
+                else:
+                    key = url
+                if key:
+                    if key not in upload_cache:
+                        download = downloads.submit(download_url_bytes, url) if url else None
+                        upload_cache[key] = pool.submit(
+                            resolve_photo_link, session, folder_id, r_i, embedded, url, download
+                        )
+                    photo_futures[r_i] = upload_cache[key]
+
+    # Share every upload that went through in as few HTTP requests as
+    # possible, even if another one failed, so no uploaded file stays private.
+    # Uploads into a link-shared folder are already public; the folder is only
+    # probed when there is something to share.
+    uploaded_ids = [
+        f.result()[1] for f in upload_cache.values()
+        if f.exception() is None and f.result()[1]
+    ]
+    if uploaded_ids and not folder_is_public(drive, folder_id):
+        set_public_anyone_reader_batch(drive, uploaded_ids)
+
+    # Second pass: swap in the resolved links. If neither image nor link,
+    # the text is left as-is. A failed upload raises here, before the
+    # output file is touched.
+    for r_i, future in photo_futures.items():
+        public_link, _ = future.result()
+        if public_link:
+            rows_out[r_i - 1][photo_idx] = public_link
+
+    # Stream rows to Excel in table order. constant_memory flushes each row to
+    # disk as it is written. Only the photo column becomes a hyperlink: with
+    # strings_to_urls, a URL-like string anywhere in a row that Excel rejects
+    # (too long, or past the per-sheet URL limit) would make write_row drop
+    # that cell and the rest of the row.
+    options = {"constant_memory": True, "strings_to_urls": False}
+    with xlsxwriter.Workbook(output_xlsx, options) as workbook:
+        worksheet = workbook.add_worksheet()
+        header_format = workbook.add_format(
+            {"bold": True, "border": 1, "align": "center", "valign": "top"}
+        )
+        worksheet.write_row(0, 0, headers, header_format)
+        for r_i, values in enumerate(rows_out, start=1):
+            for c_i, value in enumerate(values):
+                is_link = c_i == photo_idx and value.startswith(("http://", "https://"))
+                # A link Excel won't take is kept as plain text
+                if not is_link or worksheet.write_url(r_i, c_i, value) < 0:
+                    if worksheet.write(r_i, c_i, value) == -1:
+                        raise ValueError(f"Cell ({r_i}, {c_i}) is outside Excel's limits")
+
     print(f"Saved Excel: {output_xlsx}")
     print(f"Images uploaded to Drive folder: {DRIVE_FOLDER_NAME}")
 